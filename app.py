@@ -3,12 +3,23 @@ import pandas as pd
 import os
 import json
 import io
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from sqlalchemy import create_engine, text
+from functools import reduce
+from urllib.parse import quote
+from sqlalchemy import create_engine, event, text
 import plotly.express as px
 import plotly.graph_objects as go
 from dotenv import load_dotenv
 
+try:
+    import connectorx as cx  # Optional: Arrow-native reads without per-row Python objects
+except ImportError:
+    cx = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -22,6 +33,7 @@ st.set_page_config(
 from schema_data import DDL_STATEMENTS, DOCUMENTATION, SAMPLE_QUERIES
 from ollama_nl_sql import OllamaNLtoSQL
 from local_nl_sql import LocalNLtoSQL  # Fallback only
+from sql_guard import apply_row_limit, dialect_for_url, validate_read_only
 # Removed: Gemini, OpenAI - Using Ollama only
 
 # Initialize session state configuration
@@ -89,26 +101,123 @@ with st.sidebar:
 DATABASE_URL = st.session_state.db_url
 nl_parser = st.session_state.nl_parser
 
-@st.cache_resource
+# Pre-ping and recycle drop stale connections left by idle tabs; LIFO keeps
+# reusing the few warm connections instead of cycling through the whole pool
+POOL_OPTIONS = dict(pool_pre_ping=True, pool_recycle=1800)
+SERVER_POOL_OPTIONS = dict(pool_size=10, max_overflow=20, pool_timeout=30, pool_use_lifo=True)
+# Stop a runaway generated query from wedging a connection, and refuse writes
+POSTGRES_SESSION_OPTIONS = '-c statement_timeout=30000 -c default_transaction_read_only=on'
+
+def engine_options(db_url):
+    """create_engine keyword arguments for the given database URL"""
+    options = dict(POOL_OPTIONS)
+    if db_url.lower().startswith('sqlite'):
+        # SQLite pools depend on file vs memory databases and take no sizing
+        return options
+    options.update(SERVER_POOL_OPTIONS)
+    if db_url.lower().startswith('postgres'):
+        options['connect_args'] = {'options': POSTGRES_SESSION_OPTIONS}
+    return options
+
+def _set_sqlite_query_only(dbapi_connection, connection_record):
+    """Make SQLite connections reject writes at the database level"""
+    dbapi_connection.execute("PRAGMA query_only = ON")
+
+def _dispose_engine(engine):
+    """Close pooled connections when the cached engine is evicted"""
+    if engine is not None:
+        engine.dispose()
+
+def _cache_engine(func):
+    """st.cache_resource that disposes evicted engines where Streamlit supports it (1.53+)"""
+    try:
+        return st.cache_resource(on_release=_dispose_engine)(func)
+    except TypeError:  # Older Streamlit has no on_release
+        return st.cache_resource(func)
+
+@_cache_engine
 def get_engine():
     try:
-        return create_engine(DATABASE_URL)
+        engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+        if DATABASE_URL.lower().startswith('sqlite'):
+            event.listen(engine, 'connect', _set_sqlite_query_only)
+        return engine
     except Exception as e:
         return None
 
-def execute_sql(sql_query):
-    engine = get_engine()
+# Rows are pulled from the cursor in chunks and capped, so a generated query
+# without a LIMIT cannot pull an entire table into memory
+RESULT_CHUNK_SIZE = 10000
+MAX_RESULT_ROWS = 100000
+
+def _connectorx_url(db_url):
+    """
+    ConnectorX URL for a PostgreSQL database URL, or None for other databases
+
+    ConnectorX opens its own connections, outside the engine's connect hooks, so it is
+    only used where the timeout and read-only settings can travel in the URL itself
+    """
+    scheme, sep, rest = db_url.partition('://')
+    scheme = scheme.split('+')[0].lower()
+    if scheme not in ('postgres', 'postgresql'):
+        return None
+    joiner = '&' if '?' in rest else '?'
+    return f"{scheme}{sep}{rest}{joiner}options={quote(POSTGRES_SESSION_OPTIONS)}"
+
+CONNECTORX_URL = _connectorx_url(DATABASE_URL) if cx is not None else None
+
+def _read_sql_connectorx(sql_query):
+    capped_sql = f"SELECT * FROM ({sql_query.strip().rstrip(';')}) AS capped LIMIT {MAX_RESULT_ROWS + 1}"
+    df = cx.read_sql(CONNECTORX_URL, capped_sql, return_type='pandas')
+    truncated = len(df) > MAX_RESULT_ROWS
+    if truncated:
+        df = df.iloc[:MAX_RESULT_ROWS]
+    df.attrs['truncated'] = truncated
+    return df
+
+def execute_sql(sql_query, engine=None):
+    if engine is None:
+        engine = get_engine()
     if engine is None:
         return None, "Invalid Database Configuration"
+    error = validate_read_only(sql_query, dialect_for_url(DATABASE_URL))
+    if error:
+        return None, error
+    if CONNECTORX_URL is not None:
+        # The URL is known to be supported, so an error here is the query's own;
+        # running it again through SQLAlchemy would only repeat the failure
+        try:
+            return _read_sql_connectorx(sql_query), None
+        except Exception as e:
+            return None, str(e)
     try:
         with engine.connect() as conn:
-            result = conn.execute(text(sql_query))
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
+            streaming_conn = conn.execution_options(
+                stream_results=True, max_row_buffer=RESULT_CHUNK_SIZE
+            )
+            # Chunks go straight into column buffers, no intermediate list of row tuples
+            chunks = []
+            row_count = 0
+            truncated = False
+            for chunk in pd.read_sql_query(text(sql_query), streaming_conn, chunksize=RESULT_CHUNK_SIZE):
+                chunks.append(chunk)
+                row_count += len(chunk)
+                if row_count > MAX_RESULT_ROWS:
+                    truncated = True
+                    break
+            df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+            if truncated:
+                df = df.iloc[:MAX_RESULT_ROWS]
+            df.attrs['truncated'] = truncated
             return df, None
     except Exception as e:
         return None, str(e)
 
 def get_explain_plan(sql_query):
+    # EXPLAIN ANALYZE runs the statement, so it gets the same read-only check
+    error = validate_read_only(sql_query, dialect_for_url(DATABASE_URL))
+    if error:
+        return None, error
     engine = get_engine()
     try:
         with engine.connect() as conn:
@@ -124,27 +233,182 @@ def get_explain_plan(sql_query):
     except Exception as e:
         return None, str(e)
 
+class _ParseFailed(Exception):
+    """Raised inside the cached parser so failed parses are not cached"""
+
+class _QueryFailed(Exception):
+    """Raised inside the cached executor so failed queries are not cached"""
+
+def normalize_question(question):
+    """
+    Collapse whitespace and trailing punctuation so trivial variants share a cache key
+
+    Case is kept: values such as workspace names are case-sensitive in the generated SQL
+    """
+    return re.sub(r'\s+', ' ', question.strip()).rstrip('?.! ')
+
+# Known example questions are answered with their reference SQL, skipping the parser.
+# Their SQL holds no values from the question, so they match case-insensitively
+SAMPLE_SQL_BY_QUESTION = {normalize_question(q).lower(): sql for q, sql in SAMPLE_QUERIES}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_parse_question(normalized_question, parser_key, _question, _parser):
+    # The normalized text is only the cache key; the parser gets the original wording
+    # so values such as workspace names keep their case
+    sql, explanation = _parser.parse_question(_question)
+    if sql is None:
+        raise _ParseFailed(explanation)
+    return sql, explanation
+
+def _parser_key():
+    """Cache key part identifying the active parser and model"""
+    return f"{st.session_state.get('parser_type', 'local')}:{st.session_state.ollama_model}"
+
+def parse_question(question):
+    """Parse a question, reusing SQL generated for the same normalized text"""
+    normalized_question = normalize_question(question)
+    sql = SAMPLE_SQL_BY_QUESTION.get(normalized_question.lower())
+    if sql is not None:
+        return apply_row_limit(sql, dialect_for_url(DATABASE_URL)), "Matched a known example question"
+    
+    try:
+        sql, explanation = _cached_parse_question(normalized_question, _parser_key(), question, nl_parser)
+    except _ParseFailed as e:
+        return None, str(e)
+    return apply_row_limit(sql, dialect_for_url(DATABASE_URL)), explanation
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_execute_sql(sql_query, db_url):
+    df, error = execute_sql(sql_query)
+    if error:
+        raise _QueryFailed(error)
+    return df
+
+def cached_execute_sql(sql_query, db_url):
+    """Run a query, reusing results for the same SQL and database; errors are retried"""
+    try:
+        return _cached_execute_sql(sql_query, db_url), None
+    except _QueryFailed as e:
+        return None, str(e)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_decompose_question(normalized_question, parser_key, _question, _decompose):
+    # Errors propagate so a failed model call is not cached as an unsplit question
+    return _decompose(_question, raise_errors=True)
+
+def decompose_question(question):
+    """Split a multi-part question; parsers without decomposition return it whole"""
+    decompose = getattr(nl_parser, 'decompose_question', None)
+    if decompose is None:
+        return [question]
+    # Example questions are answered directly, no need to split them
+    normalized_question = normalize_question(question)
+    if normalized_question.lower() in SAMPLE_SQL_BY_QUESTION:
+        return [question]
+    with st.spinner("Breaking down your question..."):
+        try:
+            return _cached_decompose_question(normalized_question, _parser_key(), question, decompose)
+        except Exception:
+            return [question]
+
+def run_decomposed_query(question, sub_questions, show_sql):
+    """Generate and run SQL for each sub-question in parallel and merge the results"""
+    with st.spinner(f"Running {len(sub_questions)} sub-queries..."):
+        dialect = dialect_for_url(DATABASE_URL)
+        parsed = [
+            (apply_row_limit(sql, dialect) if sql else sql, explanation)
+            for sql, explanation in nl_parser.parse_questions(sub_questions)
+        ]
+        # Resolve the engine here; worker threads have no Streamlit script context
+        engine = get_engine()
+        start_ns = time.perf_counter_ns()
+        with ThreadPoolExecutor(max_workers=len(parsed)) as executor:
+            results = list(executor.map(
+                lambda item: execute_sql(item[0], engine) if item[0] else (None, item[1]),
+                parsed
+            ))
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
+    
+    frames = []
+    for sub_question, (sql, explanation), (df, error) in zip(sub_questions, parsed, results):
+        st.markdown(f"#### {sub_question}")
+        if sql is None:
+            st.error(f"❌ {explanation}")
+            continue
+        if show_sql:
+            st.code(sql, language="sql")
+        if error:
+            st.error(f"Query execution error: {error}")
+            continue
+        st.dataframe(df, use_container_width=True)
+        frames.append(df)
+    
+    if not frames:
+        return
+    
+    result_df = frames[-1]
+    key = frames[0].columns[0] if len(frames[0].columns) else None
+    if len(frames) > 1 and key is not None and all(key in df.columns for df in frames):
+        # Only a key that is unique in every frame is a real join key; a repeated one
+        # (id, status, ...) would multiply rows, and key columns of different types
+        # cannot be joined at all, so in both cases the frames stay separate
+        try:
+            result_df = reduce(
+                lambda left, right: left.merge(right, on=key, how='outer', validate='one_to_one'),
+                frames
+            )
+        except (pd.errors.MergeError, ValueError):
+            pass
+        else:
+            st.subheader("Combined Results")
+            st.dataframe(result_df, use_container_width=True)
+    
+    st.success(f"{len(frames)} of {len(sub_questions)} sub-queries returned results in {execution_time:.3f} seconds")
+    st.session_state.last_result_df = result_df
+    # A combined result has no single SQL statement to save
+    st.session_state.last_sql = None
+    st.session_state.query_history.append({
+        "question": question,
+        "sql": ";\n\n".join(sql for sql, _ in parsed if sql),
+        "rows": len(result_df),
+        "time": execution_time,
+        "timestamp": datetime.now().strftime("%H:%M:%S")
+    })
+
 # Local NL-to-SQL parser is initialized in session state
 # No external API calls needed!
 
+STATS_TABLES = ('workspaces', 'users', 'agents', 'integrations', 'agent_tools',
+                'agent_runs', 'test_runs', 'run_logs', 'errors',
+                'integration_sync_logs', 'billing_usage', 'audit_events')
+
+# One round-trip for all row counts instead of a COUNT(*) per table
+STATS_SQL = " UNION ALL ".join(
+    f"SELECT '{table}', COUNT(*) FROM {table}" for table in STATS_TABLES
+)
+
+@st.cache_data(ttl=60)
 def get_db_stats():
+    # Connection errors propagate so an empty result is not cached for a minute
     engine = get_engine()
+    if engine is None:
+        raise ConnectionError("Invalid Database Configuration")
     stats = {}
-    tables = ['workspaces', 'users', 'agents', 'integrations', 'agent_tools', 
-              'agent_runs', 'test_runs', 'run_logs', 'errors', 
-              'integration_sync_logs', 'billing_usage', 'audit_events']
     
-    try:
-        with engine.connect() as conn:
-            for table in tables:
+    with engine.connect() as conn:
+        try:
+            stats = dict(conn.execute(text(STATS_SQL)).all())
+        except Exception:
+            # A missing table fails the whole UNION, so count one by one. On PostgreSQL
+            # a failed statement aborts the transaction, so roll back before each retry
+            conn.rollback()
+            for table in STATS_TABLES:
                 try:
                     result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
                     stats[table] = result.scalar()
                 except Exception:
+                    conn.rollback()
                     stats[table] = 0
-    except Exception as e:
-        st.sidebar.error(f"Connection Error: {str(e)}")
-        return {}
         
     return stats
 
@@ -243,11 +507,15 @@ def create_chart(df, chart_type):
     fig.update_layout(height=400)
     return fig
 
+# Entries shown in the Query History panel
+QUERY_HISTORY_SIZE = 5
+
 st.title("🔍 Natural Language SQL Query System")
 st.markdown("Ask questions about your agent platform data in plain English")
 
 if "query_history" not in st.session_state:
-    st.session_state.query_history = []
+    # Only the shown entries are kept; the oldest is dropped on append
+    st.session_state.query_history = deque(maxlen=QUERY_HISTORY_SIZE)
 if "vanna_trained" not in st.session_state:
     st.session_state.vanna_trained = False
 if "saved_queries" not in st.session_state:
@@ -260,7 +528,8 @@ if "last_sql" not in st.session_state:
 with st.sidebar:
     st.header("📊 Database Statistics")
     if st.button("Refresh Stats"):
-        st.cache_data.clear()
+        # Only the stats; parse, decomposition and result caches stay warm
+        get_db_stats.clear()
     
     try:
         stats = get_db_stats()
@@ -269,7 +538,7 @@ with st.sidebar:
             with cols[i % 2]:
                 st.metric(table.replace("_", " ").title(), count)
     except Exception as e:
-        st.error(f"Error loading stats: {e}")
+        st.error(f"Connection Error: {e}")
 
 tab1, tab2, tab3 = st.tabs(["🔍 Query", "📊 Analytics Dashboard", "💾 Saved Queries"])
 
@@ -303,11 +572,14 @@ with tab1:
         show_explain = st.checkbox("Show Query Plan", value=False)
     
     if st.button("🚀 Run Query", type="primary"):
-        if use_nl and question:
+        sub_questions = decompose_question(question) if use_nl and question else []
+        if len(sub_questions) > 1:
+            run_decomposed_query(question, sub_questions, show_sql)
+        elif use_nl and question:
             # Use local NL-to-SQL parser
             with st.spinner("Parsing your question..."):
                 try:
-                    sql, explanation = nl_parser.parse_question(question)
+                    sql, explanation = parse_question(question)
                     
                     if sql is None:
                         st.error(f"❌ {explanation}")
@@ -322,14 +594,16 @@ with tab1:
                             st.subheader("Generated SQL")
                             st.code(sql, language="sql")
                         
-                        start_time = datetime.now()
-                        df, error = execute_sql(sql)
-                        execution_time = (datetime.now() - start_time).total_seconds()
+                        start_ns = time.perf_counter_ns()
+                        df, error = cached_execute_sql(sql, DATABASE_URL)
+                        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
                         
                         if error:
                             st.error(f"Query execution error: {error}")
                         else:
                             st.success(f"Query returned {len(df)} rows in {execution_time:.3f} seconds")
+                            if df.attrs.get('truncated'):
+                                st.warning(f"⚠️ Results truncated to {MAX_RESULT_ROWS:,} rows. Add a LIMIT to see a specific slice.")
                             st.session_state.last_result_df = df
                             st.dataframe(df, use_container_width=True)
                             
@@ -369,14 +643,16 @@ with tab1:
                     st.subheader("SQL Query")
                     st.code(sql, language="sql")
                 
-                start_time = datetime.now()
-                df, error = execute_sql(sql)
-                execution_time = (datetime.now() - start_time).total_seconds()
+                start_ns = time.perf_counter_ns()
+                df, error = cached_execute_sql(sql, DATABASE_URL)
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 if error:
                     st.error(f"Query execution error: {error}")
                 else:
                     st.success(f"Query returned {len(df)} rows in {execution_time:.3f} seconds")
+                    if df.attrs.get('truncated'):
+                        st.warning(f"⚠️ Results truncated to {MAX_RESULT_ROWS:,} rows. Add a LIMIT to see a specific slice.")
                     st.session_state.last_result_df = df
                     st.dataframe(df, use_container_width=True)
                     
@@ -451,7 +727,7 @@ with tab1:
     if st.session_state.query_history:
         st.divider()
         st.subheader("📜 Query History")
-        for entry in reversed(st.session_state.query_history[-5:]):
+        for entry in reversed(st.session_state.query_history):
             with st.expander(f"[{entry['timestamp']}] {entry.get('question', 'SQL Query')[:50]}..."):
                 st.write(f"**Question:** {entry.get('question', 'Direct SQL')}")
                 st.code(entry['sql'], language="sql")
@@ -5,112 +5,271 @@ No external APIs required - works completely offline
 
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Optional
 
+# SQLite datetime() modifiers for each time unit a question can use
+TIME_UNIT_MAP = {
+    'hour': 'hours',
+    'day': 'days',
+    'week': 'days',
+    'month': 'days'
+}
+
+TIME_UNIT_MULTIPLIER = {
+    'hour': 1,
+    'day': 1,
+    'week': 7,
+    'month': 30
+}
+
+# Tables and their columns, shared by every parser instance and never mutated
+TABLES = MappingProxyType({
+    'workspaces': ('id', 'name', 'owner_id', 'created_at', 'plan', 'status'),
+    'users': ('id', 'email', 'name', 'workspace_id', 'role', 'created_at'),
+    'agents': ('id', 'workspace_id', 'name', 'language', 'llm_model', 'status', 'created_at'),
+    'integrations': ('id', 'workspace_id', 'type', 'config', 'status', 'last_sync_at', 'created_at'),
+    'agent_tools': ('id', 'agent_id', 'tool_name', 'tool_config', 'created_at'),
+    'agent_runs': ('id', 'agent_id', 'workspace_id', 'run_type', 'status', 'duration_ms', 'started_at', 'completed_at'),
+    'test_runs': ('id', 'agent_id', 'workspace_id', 'test_input', 'expected_output', 'actual_output', 'result', 'error_message', 'created_at'),
+    'run_logs': ('id', 'run_id', 'step', 'event_type', 'message', 'payload', 'timestamp'),
+    'errors': ('id', 'run_id', 'workspace_id', 'source', 'code', 'message', 'metadata', 'created_at'),
+    'integration_sync_logs': ('id', 'integration_id', 'workspace_id', 'sync_type', 'status', 'items_synced', 'error_message', 'created_at'),
+    'billing_usage': ('id', 'workspace_id', 'agent_id', 'characters_generated', 'calls_made', 'tokens_used', 'total_cost_usd', 'created_at'),
+    'audit_events': ('id', 'workspace_id', 'user_id', 'action', 'entity', 'before', 'after', 'created_at')
+})
+
+LANGUAGES = MappingProxyType({
+    'english': 'en', 'hindi': 'hi', 'gujarati': 'gu', 'tamil': 'ta',
+    'telugu': 'te', 'marathi': 'mr', 'bengali': 'bn', 'kannada': 'kn',
+    'malayalam': 'ml', 'punjabi': 'pa'
+})
+
+# Language names and the codes stored in agents.language, both resolved to the code
+LANGUAGE_CODES = MappingProxyType({**{code: code for code in LANGUAGES.values()}, **LANGUAGES})
+
+# Every substring of a table name maps to the first table containing it,
+# the same table a containment scan over TABLES would pick
+_entity_to_table = {}
+for _table_name in TABLES:
+    for _start in range(len(_table_name)):
+        for _end in range(_start + 1, len(_table_name) + 1):
+            _entity_to_table.setdefault(_table_name[_start:_end], _table_name)
+TABLES_BY_ENTITY = MappingProxyType(_entity_to_table)
+
+# Table names as written or with spaces, found in one overlapping scan
+_TABLE_ORDER = MappingProxyType({table_name: i for i, table_name in enumerate(TABLES)})
+_TABLE_TERMS = MappingProxyType({
+    **{table_name: table_name for table_name in TABLES},
+    **{table_name.replace('_', ' '): table_name for table_name in TABLES}
+})
+_TABLE_SCAN = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(_TABLE_TERMS, key=len, reverse=True))) + '))'
+)
+del _entity_to_table, _table_name, _start, _end
+
 class LocalNLtoSQL:
+    # Example questions shown in the UI, built once per class
+    SUGGESTIONS = (
+        "Top 5 errors for the last 24 hours",
+        "Show all failed test runs from last week",
+        "Which integrations are inactive",
+        "List all agents using Gujarati language",
+        "Show all workspaces",
+        "Workspaces by plan",
+        "How many agents",
+        "Errors by source",
+        "Agent runs by status",
+        "Billing by workspace",
+        "Top 10 token users",
+        "Show errors for last 7 days",
+        "List all agents",
+        "Show successful test runs",
+    )
+    
+    # (sql, explanation) pairs for queries that take no parameters, built once
+    _SQL_SUCCESSFUL_TESTS = ("""
+        SELECT tr.*, a.name as agent_name 
+        FROM test_runs tr 
+        JOIN agents a ON tr.agent_id = a.id 
+        WHERE tr.result = 'pass' 
+        ORDER BY tr.created_at DESC
+        """.strip(), "Finding all successful test runs")
+    
+    _SQL_INACTIVE_INTEGRATIONS = ("""
+        SELECT i.*, w.name as workspace_name 
+        FROM integrations i 
+        JOIN workspaces w ON i.workspace_id = w.id 
+        WHERE i.status = 'inactive'
+        ORDER BY i.created_at DESC
+        """.strip(), "Finding all inactive integrations")
+    
+    _SQL_INTEGRATIONS_BY_STATUS = ("""
+        SELECT type, status, COUNT(*) as count 
+        FROM integrations 
+        GROUP BY type, status 
+        ORDER BY type, status
+        """.strip(), "Grouping integrations by type and status")
+    
+    _SQL_ALL_AGENTS = ("""
+        SELECT a.*, w.name as workspace_name 
+        FROM agents a 
+        JOIN workspaces w ON a.workspace_id = w.id 
+        ORDER BY a.created_at DESC
+        """.strip(), "Listing all agents")
+    
+    _SQL_ALL_WORKSPACES = ("""
+        SELECT * 
+        FROM workspaces 
+        ORDER BY created_at DESC
+        """.strip(), "Listing all workspaces")
+    
+    _SQL_WORKSPACES_BY_PLAN = ("""
+        SELECT plan, COUNT(*) as count 
+        FROM workspaces 
+        GROUP BY plan 
+        ORDER BY count DESC
+        """.strip(), "Grouping workspaces by plan type")
+    
+    _SQL_ERRORS_BY_SOURCE = ("""
+        SELECT source, COUNT(*) as count 
+        FROM errors 
+        GROUP BY source 
+        ORDER BY count DESC
+        """.strip(), "Grouping errors by source")
+    
+    _SQL_AGENT_RUNS_STATUS = ("""
+        SELECT a.name as agent_name, ar.status, COUNT(*) as count 
+        FROM agent_runs ar 
+        JOIN agents a ON ar.agent_id = a.id 
+        GROUP BY a.name, ar.status 
+        ORDER BY a.name, ar.status
+        """.strip(), "Grouping agent runs by status")
+    
+    _SQL_BILLING_BY_WORKSPACE = ("""
+        SELECT w.name as workspace_name, 
+               SUM(b.total_cost_usd) as total_cost, 
+               SUM(b.tokens_used) as total_tokens,
+               SUM(b.calls_made) as total_calls
+        FROM billing_usage b 
+        JOIN workspaces w ON b.workspace_id = w.id 
+        GROUP BY w.id, w.name 
+        ORDER BY total_cost DESC
+        """.strip(), "Showing billing usage by workspace")
+    
     def __init__(self):
-        self.tables = {
-            'workspaces': ['id', 'name', 'owner_id', 'created_at', 'plan', 'status'],
-            'users': ['id', 'email', 'name', 'workspace_id', 'role', 'created_at'],
-            'agents': ['id', 'workspace_id', 'name', 'language', 'llm_model', 'status', 'created_at'],
-            'integrations': ['id', 'workspace_id', 'type', 'config', 'status', 'last_sync_at', 'created_at'],
-            'agent_tools': ['id', 'agent_id', 'tool_name', 'tool_config', 'created_at'],
-            'agent_runs': ['id', 'agent_id', 'workspace_id', 'run_type', 'status', 'duration_ms', 'started_at', 'completed_at'],
-            'test_runs': ['id', 'agent_id', 'workspace_id', 'test_input', 'expected_output', 'actual_output', 'result', 'error_message', 'created_at'],
-            'run_logs': ['id', 'run_id', 'step', 'event_type', 'message', 'payload', 'timestamp'],
-            'errors': ['id', 'run_id', 'workspace_id', 'source', 'code', 'message', 'metadata', 'created_at'],
-            'integration_sync_logs': ['id', 'integration_id', 'workspace_id', 'sync_type', 'status', 'items_synced', 'error_message', 'created_at'],
-            'billing_usage': ['id', 'workspace_id', 'agent_id', 'characters_generated', 'calls_made', 'tokens_used', 'total_cost_usd', 'created_at'],
-            'audit_events': ['id', 'workspace_id', 'user_id', 'action', 'entity', 'before', 'after', 'created_at']
-        }
-        
-        self.languages = {
-            'english': 'en', 'hindi': 'hi', 'gujarati': 'gu', 'tamil': 'ta',
-            'telugu': 'te', 'marathi': 'mr', 'bengali': 'bn', 'kannada': 'kn',
-            'malayalam': 'ml', 'punjabi': 'pa'
-        }
-        
-        # Common query patterns
+        # Schema lookups are shared module-level constants, kept as attributes
+        # for callers that read them from the instance
+        self.tables = TABLES
+        self.languages = LANGUAGES
+        
+        # Common query patterns. Each one needs at least one of its trigger
+        # keywords in the question, so a single keyword scan narrows the
+        # patterns worth running
         self.patterns = self._build_patterns()
+        keywords = sorted({kw for p in self.patterns for kw in p['keywords']}, key=len, reverse=True)
+        self._keyword_scan = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+        
+        # Parsing is deterministic, so repeated questions reuse earlier results
+        self._parse_cached = lru_cache(maxsize=512)(self._parse_normalized)
     
     def _build_patterns(self) -> List[Dict]:
-        """Build regex patterns for common query types"""
+        """
+        Build compiled regex patterns for common query types (questions are lowercased first)
+        'keywords' must include a literal that every match of the pattern contains
+        """
         return [
             # Top/Most queries
             {
-                'pattern': r'top\s+(\d+)\s+errors?\s+(?:for|in|from)?\s*(?:the)?\s*last\s+(\d+)\s+(hour|day|week|month)s?',
+                'regex': re.compile(r'top\s+(?P<top_errors_limit>\d+)\s+errors?\s+(?:for|in|from)?\s*(?:the)?\s*last\s+(?P<top_errors_value>\d+)\s+(?P<top_errors_unit>hour|day|week|month)s?'),
+                'keywords': ('error',),
                 'handler': self._handle_top_errors
             },
             {
-                'pattern': r'(?:show|list|get|find)\s+(?:all\s+)?errors?\s+(?:for|in|from)?\s*(?:the)?\s*last\s+(\d+)\s+(hour|day|week|month)s?',
+                'regex': re.compile(r'(?:show|list|get|find)\s+(?:all\s+)?errors?\s+(?:for|in|from)?\s*(?:the)?\s*last\s+(?P<errors_timeframe_value>\d+)\s+(?P<errors_timeframe_unit>hour|day|week|month)s?'),
+                'keywords': ('error',),
                 'handler': self._handle_errors_timeframe
             },
             
             # Failed/Success queries
             {
-                'pattern': r'(?:show|list|get|find)\s+(?:all\s+)?failed\s+test\s*runs?\s+(?:for|in|from)?\s*(?:the)?\s*last\s+(\d+)\s+(hour|day|week|month)s?',
+                'regex': re.compile(r'(?:show|list|get|find)\s+(?:all\s+)?failed\s+test\s*runs?\s+(?:for|in|from)?\s*(?:the)?\s*last\s+(?P<failed_tests_value>\d+)\s+(?P<failed_tests_unit>hour|day|week|month)s?'),
+                'keywords': ('failed',),
                 'handler': self._handle_failed_tests
             },
             {
-                'pattern': r'(?:show|list|get|find)\s+(?:all\s+)?(?:successful|passed)\s+test\s*runs?',
+                'regex': re.compile(r'(?:show|list|get|find)\s+(?:all\s+)?(?:successful|passed)\s+test\s*runs?'),
+                'keywords': ('successful', 'passed'),
                 'handler': self._handle_successful_tests
             },
             
             # Integration queries
             {
-                'pattern': r'(?:which|what|show|list)\s+integrations?\s+(?:are\s+)?inactive',
+                'regex': re.compile(r'(?:which|what|show|list)\s+integrations?\s+(?:are\s+)?inactive'),
+                'keywords': ('inactive',),
                 'handler': self._handle_inactive_integrations
             },
             {
-                'pattern': r'(?:show|list|get)\s+(?:all\s+)?integrations?\s+(?:by\s+)?status',
+                'regex': re.compile(r'(?:show|list|get)\s+(?:all\s+)?integrations?\s+(?:by\s+)?status'),
+                'keywords': ('status',),
                 'handler': self._handle_integrations_by_status
             },
             
             # Agent queries
             {
-                'pattern': r'(?:show|list|get|find)\s+(?:all\s+)?agents?\s+(?:using|with|in)\s+(\w+)\s+language',
+                'regex': re.compile(r'(?:show|list|get|find)\s+(?:all\s+)?agents?\s+(?:using|with|in)\s+(?P<language>\w+)\s+language'),
+                'keywords': ('language',),
                 'handler': self._handle_agents_by_language
             },
             {
-                'pattern': r'(?:show|list|get)\s+(?:all\s+)?agents?',
+                'regex': re.compile(r'(?:show|list|get)\s+(?:all\s+)?agents?'),
+                'keywords': ('agent',),
                 'handler': self._handle_all_agents
             },
             
             # Workspace queries
             {
-                'pattern': r'(?:show|list|get)\s+(?:all\s+)?workspaces?',
+                'regex': re.compile(r'(?:show|list|get)\s+(?:all\s+)?workspaces?'),
+                'keywords': ('workspace',),
                 'handler': self._handle_all_workspaces
             },
             {
-                'pattern': r'workspaces?\s+(?:by\s+)?plan',
+                'regex': re.compile(r'workspaces?\s+(?:by\s+)?plan'),
+                'keywords': ('plan',),
                 'handler': self._handle_workspaces_by_plan
             },
             
             # Count queries
             {
-                'pattern': r'(?:how many|count)\s+(\w+)',
+                'regex': re.compile(r'(?:how many|count)\s+(?P<count_entity>\w+)'),
+                'keywords': ('how many', 'count'),
                 'handler': self._handle_count
             },
             
             # Error source queries
             {
-                'pattern': r'errors?\s+(?:by\s+)?source',
+                'regex': re.compile(r'errors?\s+(?:by\s+)?source'),
+                'keywords': ('source',),
                 'handler': self._handle_errors_by_source
             },
             
             # Agent runs
             {
-                'pattern': r'agent\s+runs?\s+(?:by\s+)?status',
+                'regex': re.compile(r'agent\s+runs?\s+(?:by\s+)?status'),
+                'keywords': ('status',),
                 'handler': self._handle_agent_runs_status
             },
             
             # Billing/Usage
             {
-                'pattern': r'(?:billing|usage|cost)\s+(?:by\s+)?workspace',
+                'regex': re.compile(r'(?:billing|usage|cost)\s+(?:by\s+)?workspace'),
+                'keywords': ('workspace',),
                 'handler': self._handle_billing_by_workspace
             },
             {
-                'pattern': r'(?:top|highest)\s+(\d+)\s+(?:token|cost|usage)',
+                'regex': re.compile(r'(?:top|highest)\s+(?P<top_usage_limit>\d+)\s+(?:token|cost|usage)'),
+                'keywords': ('token', 'cost', 'usage'),
                 'handler': self._handle_top_usage
             },
         ]
@@ -120,11 +279,16 @@ class LocalNLtoSQL:
         Parse natural language question and return SQL query
         Returns: (sql_query, explanation)
         """
-        question = question.lower().strip()
-        
-        # Try each pattern
+        return self._parse_cached(question.lower().strip())
+    
+    def _parse_normalized(self, question: str) -> Tuple[Optional[str], Optional[str]]:
+        """Parse a lowercased, stripped question; results are memoized per instance"""
+        # Try each pattern whose trigger keywords appear in the question
+        found = {m.group(1) for m in self._keyword_scan.finditer(question)}
         for pattern_info in self.patterns:
-            match = re.search(pattern_info['pattern'], question, re.IGNORECASE)
+            if found.isdisjoint(pattern_info['keywords']):
+                continue
+            match = pattern_info['regex'].search(question)
             if match:
                 try:
                     sql, explanation = pattern_info['handler'](match, question)
@@ -137,9 +301,9 @@ class LocalNLtoSQL:
     
     def _handle_top_errors(self, match, question):
         """Handle 'top N errors for last X days' queries"""
-        limit = match.group(1)
-        time_value = match.group(2)
-        time_unit = match.group(3)
+        limit = match.group('top_errors_limit')
+        time_value = match.group('top_errors_value')
+        time_unit = match.group('top_errors_unit')
         
         time_filter = self._get_time_filter(time_value, time_unit)
         
@@ -157,8 +321,8 @@ class LocalNLtoSQL:
     
     def _handle_errors_timeframe(self, match, question):
         """Handle 'show errors for last X days' queries"""
-        time_value = match.group(1)
-        time_unit = match.group(2)
+        time_value = match.group('errors_timeframe_value')
+        time_unit = match.group('errors_timeframe_unit')
         
         time_filter = self._get_time_filter(time_value, time_unit)
         
@@ -174,8 +338,8 @@ class LocalNLtoSQL:
     
     def _handle_failed_tests(self, match, question):
         """Handle failed test runs queries"""
-        time_value = match.group(1)
-        time_unit = match.group(2)
+        time_value = match.group('failed_tests_value')
+        time_unit = match.group('failed_tests_unit')
         
         time_filter = self._get_time_filter(time_value, time_unit)
         
@@ -193,46 +357,24 @@ class LocalNLtoSQL:
     
     def _handle_successful_tests(self, match, question):
         """Handle successful test runs queries"""
-        sql = """
-        SELECT tr.*, a.name as agent_name 
-        FROM test_runs tr 
-        JOIN agents a ON tr.agent_id = a.id 
-        WHERE tr.result = 'pass' 
-        ORDER BY tr.created_at DESC
-        """
-        
-        explanation = "Finding all successful test runs"
-        return sql.strip(), explanation
+        return self._SQL_SUCCESSFUL_TESTS
     
     def _handle_inactive_integrations(self, match, question):
         """Handle inactive integrations queries"""
-        sql = """
-        SELECT i.*, w.name as workspace_name 
-        FROM integrations i 
-        JOIN workspaces w ON i.workspace_id = w.id 
-        WHERE i.status = 'inactive'
-        ORDER BY i.created_at DESC
-        """
-        
-        explanation = "Finding all inactive integrations"
-        return sql.strip(), explanation
+        return self._SQL_INACTIVE_INTEGRATIONS
     
     def _handle_integrations_by_status(self, match, question):
         """Handle integrations by status queries"""
-        sql = """
-        SELECT type, status, COUNT(*) as count 
-        FROM integrations 
-        GROUP BY type, status 
-        ORDER BY type, status
-        """
-        
-        explanation = "Grouping integrations by type and status"
-        return sql.strip(), explanation
+        return self._SQL_INTEGRATIONS_BY_STATUS
     
     def _handle_agents_by_language(self, match, question):
         """Handle agents by language queries"""
-        language_name = match.group(1).lower()
-        language_code = self.languages.get(language_name, language_name[:2])
+        language_name = match.group('language')
+        language_code = LANGUAGE_CODES.get(language_name)
+        if language_code is None:
+            # Answering with every agent would look like a successful filter
+            supported = ', '.join(name.title() for name in LANGUAGES)
+            return None, f"Unsupported language '{language_name}'. Supported languages: {supported}"
         
         sql = f"""
         SELECT a.*, w.name as workspace_name 
@@ -247,49 +389,22 @@ class LocalNLtoSQL:
     
     def _handle_all_agents(self, match, question):
         """Handle show all agents queries"""
-        sql = """
-        SELECT a.*, w.name as workspace_name 
-        FROM agents a 
-        JOIN workspaces w ON a.workspace_id = w.id 
-        ORDER BY a.created_at DESC
-        """
-        
-        explanation = "Listing all agents"
-        return sql.strip(), explanation
+        return self._SQL_ALL_AGENTS
     
     def _handle_all_workspaces(self, match, question):
         """Handle show all workspaces queries"""
-        sql = """
-        SELECT * 
-        FROM workspaces 
-        ORDER BY created_at DESC
-        """
-        
-        explanation = "Listing all workspaces"
-        return sql.strip(), explanation
+        return self._SQL_ALL_WORKSPACES
     
     def _handle_workspaces_by_plan(self, match, question):
         """Handle workspaces by plan queries"""
-        sql = """
-        SELECT plan, COUNT(*) as count 
-        FROM workspaces 
-        GROUP BY plan 
-        ORDER BY count DESC
-        """
-        
-        explanation = "Grouping workspaces by plan type"
-        return sql.strip(), explanation
+        return self._SQL_WORKSPACES_BY_PLAN
     
     def _handle_count(self, match, question):
         """Handle count queries"""
-        entity = match.group(1).lower()
+        entity = match.group('count_entity').lower()
         
         # Find matching table
-        table = None
-        for table_name in self.tables.keys():
-            if entity in table_name or table_name.startswith(entity):
-                table = table_name
-                break
+        table = TABLES_BY_ENTITY.get(entity)
         
         if not table:
             return None, None
@@ -300,48 +415,19 @@ class LocalNLtoSQL:
     
     def _handle_errors_by_source(self, match, question):
         """Handle errors by source queries"""
-        sql = """
-        SELECT source, COUNT(*) as count 
-        FROM errors 
-        GROUP BY source 
-        ORDER BY count DESC
-        """
-        
-        explanation = "Grouping errors by source"
-        return sql.strip(), explanation
+        return self._SQL_ERRORS_BY_SOURCE
     
     def _handle_agent_runs_status(self, match, question):
         """Handle agent runs by status queries"""
-        sql = """
-        SELECT a.name as agent_name, ar.status, COUNT(*) as count 
-        FROM agent_runs ar 
-        JOIN agents a ON ar.agent_id = a.id 
-        GROUP BY a.name, ar.status 
-        ORDER BY a.name, ar.status
-        """
-        
-        explanation = "Grouping agent runs by status"
-        return sql.strip(), explanation
+        return self._SQL_AGENT_RUNS_STATUS
     
     def _handle_billing_by_workspace(self, match, question):
         """Handle billing by workspace queries"""
-        sql = """
-        SELECT w.name as workspace_name, 
-               SUM(b.total_cost_usd) as total_cost, 
-               SUM(b.tokens_used) as total_tokens,
-               SUM(b.calls_made) as total_calls
-        FROM billing_usage b 
-        JOIN workspaces w ON b.workspace_id = w.id 
-        GROUP BY w.id, w.name 
-        ORDER BY total_cost DESC
-        """
-        
-        explanation = "Showing billing usage by workspace"
-        return sql.strip(), explanation
+        return self._SQL_BILLING_BY_WORKSPACE
     
     def _handle_top_usage(self, match, question):
         """Handle top usage queries"""
-        limit = match.group(1)
+        limit = match.group('top_usage_limit')
         
         sql = f"""
         SELECT a.name as agent_name, 
@@ -360,12 +446,9 @@ class LocalNLtoSQL:
     def _keyword_based_query(self, question: str) -> Tuple[Optional[str], Optional[str]]:
         """Fallback: keyword-based query generation"""
         
-        # Detect table from keywords
-        table = None
-        for table_name in self.tables.keys():
-            if table_name.replace('_', ' ') in question or table_name in question:
-                table = table_name
-                break
+        # Detect table from keywords, preferring tables listed first
+        found = {_TABLE_TERMS[m.group(1)] for m in _TABLE_SCAN.finditer(question)}
+        table = min(found, key=_TABLE_ORDER.get) if found else None
         
         if not table:
             return None, "Could not understand the question. Try using query templates or be more specific."
@@ -376,42 +459,15 @@ class LocalNLtoSQL:
         
         return sql, explanation
     
-    def _get_time_filter(self, value: str, unit: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_time_filter(value: str, unit: str) -> str:
         """Generate time filter for SQLite"""
-        unit_map = {
-            'hour': 'hours',
-            'day': 'days',
-            'week': 'days',
-            'month': 'days'
-        }
-        
-        multiplier = {
-            'hour': 1,
-            'day': 1,
-            'week': 7,
-            'month': 30
-        }
-        
-        actual_value = int(value) * multiplier.get(unit, 1)
-        actual_unit = unit_map.get(unit, 'days')
+        actual_value = int(value) * TIME_UNIT_MULTIPLIER.get(unit, 1)
+        actual_unit = TIME_UNIT_MAP.get(unit, 'days')
         
         return f"datetime('now', '-{actual_value} {actual_unit}')"
     
     def get_suggestions(self) -> List[str]:
         """Get list of example questions"""
-        return [
-            "Top 5 errors for the last 24 hours",
-            "Show all failed test runs from last week",
-            "Which integrations are inactive",
-            "List all agents using Gujarati language",
-            "Show all workspaces",
-            "Workspaces by plan",
-            "How many agents",
-            "Errors by source",
-            "Agent runs by status",
-            "Billing by workspace",
-            "Top 10 token users",
-            "Show errors for last 7 days",
-            "List all agents",
-            "Show successful test runs"
-        ]
+        return list(self.SUGGESTIONS)
@@ -3,43 +3,86 @@ Ollama Local LLM powered Natural Language to SQL Converter
 Runs completely locally - no API costs, no internet needed, complete privacy
 """
 
+import hashlib
+import json
 import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import numpy as np
 import requests
-from typing import Tuple, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional
 
-class OllamaNLtoSQL:
-    def __init__(self, model: str = "llama3.1", base_url: str = "http://localhost:11434"):
-        """
-        Initialize Ollama NL-to-SQL converter
-        
-        Args:
-            model: Ollama model to use (e.g., 'llama3.1', 'mistral', 'codellama', 'deepseek-coder')
-            base_url: Ollama server URL (default: http://localhost:11434)
-        """
-        self.model = model
-        self.base_url = base_url
-        self.api_url = f"{base_url}/api/generate"
-        
-        # Test connection
-        if not self._test_connection():
-            raise ConnectionError(
-                f"Cannot connect to Ollama at {base_url}. "
-                f"Make sure Ollama is running. Install from: https://ollama.ai"
-            )
-        
-        self.schema_info = self._get_default_schema()
-    
-    def _test_connection(self) -> bool:
-        """Test if Ollama is running"""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            return response.status_code == 200
-        except Exception:
-            return False
-    
-    def _get_default_schema(self) -> str:
-        """Get concise database schema with EXACT column names"""
-        return """
+try:
+    import orjson  # Optional: faster encoding of the multi-KB prompt and streamed chunks
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Responses worth retrying: rate limiting, a busy queue or a server restarting
+_RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_DELAY = 10
+
+# A line starting with SELECT or a WITH clause, optionally after an "SQL:" style
+# label. Prose such as "a query to select data:" or "With the schema above" is
+# skipped because it does not start a query at the start of a line
+_STATEMENT_START = (
+    r'^[ \t]*(?:(?:SQL|Query|Answer):[ \t]*)?'
+    r'(?=SELECT\b|WITH\s+(?:RECURSIVE\s+)?\w+\s*(?:\([^)]*\)\s*)?AS\s*\()'
+)
+# First query in a model response, up to a semicolon outside string literals and
+# comments, or the end of the text
+_SELECT_STATEMENT = re.compile(
+    _STATEMENT_START + r"((?:SELECT|WITH)\b(?:'(?:[^']|'')*'|--[^\n]*|-(?!-)|[^;'-])*)",
+    re.IGNORECASE | re.MULTILINE
+)
+_CODE_FENCE = re.compile(r'```(?:sql)?', re.IGNORECASE)
+# -- comments, matched after string literals so text inside quotes is kept
+_LITERAL_OR_COMMENT = re.compile(r"('(?:[^']|'')*')|--[^\n]*")
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+# Time words that change a query's window, in _vocabulary's singular form
+_TIME_WORDS = frozenset({
+    'minute', 'hour', 'day', 'week', 'month', 'quarter', 'year', 'today', 'yesterday',
+})
+# Letters only, so snake_case identifiers split into their words
+_WORD = re.compile(r'[a-z]{3,}')
+# Unicode word tokens, so questions in any script are recognised
+_TOKEN = re.compile(r'\w+')
+# Input made only of these words is small talk, not a data question
+_SMALL_TALK_WORDS = frozenset({
+    'hi', 'hey', 'hello', 'yo', 'help', 'thanks', 'thank', 'you', 'thx', 'ok', 'okay',
+    'yes', 'no', 'bye', 'goodbye', 'good', 'morning', 'afternoon', 'evening', 'there',
+    'please', 'test', 'testing', 'what', 'can', 'do', 'who', 'are', 'how', 'is', 'it', 'going',
+})
+# Bullets or numbering models add to list items despite the instructions
+_LIST_MARKER = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+_CONTENT_WORD = re.compile(r'\w{3,}')
+# Words too common to show that a line of a reply is about the question
+_FILLER_WORDS = frozenset({
+    'the', 'and', 'for', 'are', 'here', 'these', 'those', 'this', 'that', 'they', 'them',
+    'sure', 'can', 'into', 'with', 'from', 'each', 'question', 'questions', 'split',
+    'following', 'independent', 'answered', 'query', 'queries', 'sql', 'one',
+})
+# A SELECT followed by its terminating semicolon or closing code fence. Like
+# _SELECT_STATEMENT it skips string literals and comments, so a ';' inside them
+# does not end the statement; single backticks are allowed, a fence is not
+_COMPLETE_SELECT = re.compile(
+    _STATEMENT_START
+    + r"(?:SELECT|WITH)\b(?:'(?:[^']|'')*+'|--[^\n]*+|-(?!-)|`(?!``)|[^;'`-])*+(?:;|```)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Built once at import and shared by every instance
+_DEFAULT_SCHEMA = """
 DATABASE: Agent Platform (SQLite)
 
 IMPORTANT: Use EXACT column names shown below!
@@ -112,21 +155,137 @@ A: SELECT name FROM agents WHERE language='hi' AND status='active'
 Q: "Failed runs today"
 A: SELECT * FROM agent_runs WHERE status='failed' AND date(started_at)=date('now') ORDER BY started_at DESC
 """
+
+
+_BLANK_LINES = re.compile(r'\n\s*\n')
+_INDENTED_CONTINUATION = re.compile(r':\n[ \t]+')
+
+
+def _compact_schema(schema: str) -> str:
+    """Schema text without blank lines, with each table's columns on the table's line"""
+    schema = _BLANK_LINES.sub('\n', schema.strip())
+    return _INDENTED_CONTINUATION.sub(': ', schema)
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retrying: the server's Retry-After, else exponential backoff with jitter"""
+    if retry_after:
+        try:
+            return max(0.0, min(float(retry_after), MAX_RETRY_DELAY))
+        except ValueError:
+            pass  # HTTP-date form, fall back to backoff
+    return min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+
+
+def _vocabulary(text: str) -> frozenset:
+    """Words of three or more letters in text, lowercased and without a plural 's'"""
+    return frozenset(w[:-1] if w.endswith('s') else w for w in _WORD.findall(text.lower()))
+
+
+class OllamaNLtoSQL:
+    # Example questions shown in the UI, built once per class
+    SUGGESTIONS = (
+        # Workspace queries
+        "Show all workspaces and their plans",
+        "Which workspaces are on enterprise plan?",
+        "List suspended workspaces",
+        "Count agents per workspace",
+        
+        # Agent queries
+        "Show all agents using Hindi language",
+        "List all Gujarati and Tamil agents",
+        "Show inactive or draft agents",
+        "How many agents use each language?",
+        
+        # Error and failure analysis
+        "Top 5 error codes from last week",
+        "Show all errors from integration source",
+        
+        # Test and run analysis
+        "Show all failed test runs from last month",
+        "Which runs took longer than 5 seconds?",
+        
+        # Integration queries
+        "Which integrations failed to sync?",
+        "List inactive integrations",
+        
+        # Billing and usage
+        "Total billing cost by workspace",
+        "Show top 5 workspaces by total cost",
+        "Billing usage for last 30 days",
+        
+        # User queries
+        "How many admin users per workspace?",
+        
+        # Complex queries
+        "Most common error messages",
+    )
     
-    def parse_question(self, question: str) -> Tuple[Optional[str], Optional[str]]:
+    # Questions this short are sent whole; a decomposition call would cost more than it saves
+    DECOMPOSE_MIN_WORDS = 12
+    MAX_SUB_QUESTIONS = 4
+    # Requests in flight at once; Ollama queues the rest anyway, so more only adds memory
+    MAX_CONCURRENT_REQUESTS = 4
+    # Extra attempts after a transient failure; other errors are returned at once
+    MAX_RETRIES = 2
+    # Token budget for the generated SQL and for the question itself
+    MAX_SQL_TOKENS = 256
+    QUESTION_TOKEN_RESERVE = 256
+    # Smallest context window requested; Ollama silently drops the start of longer prompts
+    MIN_CONTEXT_TOKENS = 4096
+    # Keep the model, and with it the cached prompt prefix, loaded between questions
+    KEEP_ALIVE = "30m"
+    SQL_CACHE_SIZE = 256
+    SEMANTIC_CACHE_SIZE = 256
+    # Seconds a test_connection result is reused, so polling it doesn't hit the server each time
+    HEALTH_CHECK_TTL = 5
+    # Sentence-embedding model for the semantic cache; a generation model's embeddings
+    # are a poor similarity signal
+    DEFAULT_EMBED_MODEL = "nomic-embed-text"
+    
+    def __init__(self, model: str = "llama3.1", base_url: str = "http://localhost:11434",
+                 schema_info: Optional[str] = None, cache_path: Optional[str] = None,
+                 embed_model: Optional[str] = None):
         """
-        Convert natural language question to SQL query using Ollama
+        Initialize Ollama NL-to-SQL converter
         
         Args:
-            question: Natural language question
-            
-        Returns:
-            Tuple of (sql_query, explanation)
+            model: Ollama model to use (e.g., 'llama3.1', 'mistral', 'codellama', 'deepseek-coder')
+            base_url: Ollama server URL (default: http://localhost:11434)
+            schema_info: Schema description for the prompt (default: the Agent Platform schema)
+            cache_path: SQLite file that keeps generated SQL across restarts
+                        (default: $OLLAMA_SQL_CACHE_PATH, unset disables it)
+            embed_model: Ollama embedding model for the semantic cache
+                         (default: $OLLAMA_EMBED_MODEL, else nomic-embed-text)
         """
-        try:
-            prompt = f"""Convert this question to SQLite query.
+        self.model = model
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api/generate"
+        
+        # Keep-alive connections to the Ollama server, reused across calls
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.MAX_CONCURRENT_REQUESTS
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Test connection
+        self._health_checked_at = None
+        self._healthy = False
+        if not self._test_connection():
+            raise ConnectionError(
+                f"Cannot connect to Ollama at {base_url}. "
+                f"Make sure Ollama is running. Install from: https://ollama.ai"
+            )
+        
+        self.schema_info = schema_info or _DEFAULT_SCHEMA
+        
+        # Everything before the question is static, so build it once. Keeping it identical
+        # for every question also lets Ollama reuse its evaluated prefix between calls
+        self._prompt_prefix = f"""Convert this question to SQLite query.
 
-{self.schema_info}
+{_compact_schema(self.schema_info)}
 
 RULES:
 - Return ONLY SQL query, no explanations
@@ -135,30 +294,257 @@ RULES:
 - SELECT only (read-only)
 - Add ORDER BY and LIMIT
 
-QUESTION: {question}
-
-SQL:"""
-
-            # Call Ollama API
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Low temperature for consistent SQL
-                        "top_p": 0.9,
-                    }
-                },
-                timeout=100  # 1 minutes timeout for slower models
-            )
+QUESTION: """
+        self._prompt_suffix = "\n\nSQL:"
+        
+        # Schema and time words; semantically cached SQL is only reused between
+        # questions that mention exactly the same ones
+        self._vocabulary = _vocabulary(self.schema_info) | _TIME_WORDS
+        
+        # Successfully generated SQL per normalized question, least recently used first.
+        # Guarded by a lock since parse_questions calls in from worker threads
+        self._sql_cache = OrderedDict()
+        self._sql_cache_lock = threading.Lock()
+        
+        # Disk entries are tagged with the model and schema so a change to either misses
+        self._schema_hash = hashlib.blake2b(self.schema_info.encode('utf-8'), digest_size=8).hexdigest()
+        cache_path = cache_path or os.environ.get("OLLAMA_SQL_CACHE_PATH")
+        self._disk_cache = self._open_disk_cache(cache_path) if cache_path else None
+        
+        # Paraphrases of earlier questions can reuse their SQL when their embeddings are
+        # this similar. Off unless OLLAMA_SEM_CACHE_THRESHOLD is set, e.g. to 0.95
+        self._semantic_threshold = self._semantic_threshold_from_env()
+        self.embed_model = embed_model or os.environ.get("OLLAMA_EMBED_MODEL") or self.DEFAULT_EMBED_MODEL
+        self._semantic_cache = deque(maxlen=self.SEMANTIC_CACHE_SIZE)
+        
+        # Size the context window once from the static prompt so a large schema is never
+        # truncated. Local models have no shared tokenizer, so estimate ~3 characters per token
+        prompt_tokens = len(self._prompt_prefix) // 3 + self.QUESTION_TOKEN_RESERVE + self.MAX_SQL_TOKENS
+        num_ctx = max(self.MIN_CONTEXT_TOKENS, -(-prompt_tokens // 1024) * 1024)
+        
+        # Options sent with every request to self.model. Ollama reloads the model when
+        # num_ctx changes, so decomposition and embedding calls must send the same value
+        self._model_options = {
+            "temperature": 0,  # Deterministic, so cached SQL matches what a new call would return
+            "num_ctx": num_ctx,
+        }
+        
+        # Request fields shared by every SQL generation call; only the prompt varies
+        self._generate_payload = {
+            "model": self.model,
+            "stream": True,
+            "keep_alive": self.KEEP_ALIVE,
+            "options": {
+                **self._model_options,
+                # One SELECT rarely needs more. There is no server-side ';' stop: Ollama
+                # matches stop strings on raw text and would cut LIKE '%;%' short, so the
+                # literal-aware check in _read_sql_stream ends the statement instead
+                "num_predict": self.MAX_SQL_TOKENS,
+            }
+        }
+    
+    def _test_connection(self) -> bool:
+        """Test if Ollama is running"""
+        try:
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=2)
+            return response.status_code == 200
+        except Exception:
+            return False
+    
+    def parse_question(self, question: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Convert natural language question to SQL query using Ollama
+        
+        Args:
+            question: Natural language question
             
+        Returns:
+            Tuple of (sql_query, explanation)
+        """
+        # Empty input and greetings would only waste a model call
+        words = _TOKEN.findall(question.lower())
+        if not words or all(word in _SMALL_TALK_WORDS for word in words):
+            return None, "That doesn't look like a question about the data. Try one of the example questions."
+        
+        # Case is kept: values such as workspace names are case-sensitive in the SQL
+        key = ' '.join(question.split())
+        with self._sql_cache_lock:
+            cached = self._sql_cache.get(key)
+            if cached is not None:
+                self._sql_cache.move_to_end(key)
+                return cached
+            cached = self._disk_cache_get(key)
+            if cached is not None:
+                self._remember_sql(key, cached)
+                return cached
+        
+        embedding = None
+        if self._semantic_threshold is not None and self._semantic_cache:
+            embedding = self._embed(key)
+            cached = self._semantic_cache_get(key, embedding)
+            if cached is not None:
+                return cached
+        
+        sql, explanation = self._generate_sql(question)
+        
+        # Failures (timeouts, server down) are not cached so they are retried
+        if sql is not None:
+            with self._sql_cache_lock:
+                self._remember_sql(key, (sql, explanation))
+                self._disk_cache_put(key, (sql, explanation))
+            if self._semantic_threshold is not None:
+                if embedding is None:
+                    embedding = self._embed(key)
+                if embedding is not None:
+                    with self._sql_cache_lock:
+                        self._semantic_cache.append(
+                            (self._semantic_signature(key), embedding, (sql, explanation))
+                        )
+        return sql, explanation
+    
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of text from Ollama, or None if it is unavailable"""
+        try:
+            response = self._session.post(
+                f"{self.base_url}/api/embed",
+                data=_json_dumps({
+                    "model": self.embed_model,
+                    "input": text,
+                    "keep_alive": self.KEEP_ALIVE,
+                    # Same options as generation when both share a model, so it isn't reloaded
+                    **({"options": self._model_options} if self.embed_model == self.model else {})
+                }),
+                headers=_JSON_HEADERS,
+                timeout=10
+            )
             if response.status_code != 200:
-                return None, f"Ollama API error: {response.status_code}"
+                return None
+            vector = np.asarray(_json_loads(response.content)['embeddings'][0], dtype=np.float32)
+        except Exception:
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    @staticmethod
+    def _semantic_threshold_from_env() -> Optional[float]:
+        """OLLAMA_SEM_CACHE_THRESHOLD as a similarity in (0, 1], or None to disable the cache"""
+        threshold = os.environ.get("OLLAMA_SEM_CACHE_THRESHOLD")
+        if not threshold:
+            return None
+        try:
+            value = float(threshold)
+        except ValueError:
+            value = None
+        if value is None or not 0 < value <= 1:
+            print(f"Ignoring OLLAMA_SEM_CACHE_THRESHOLD={threshold!r}, expected a number in (0, 1]")
+            return None
+        return value
+    
+    def _semantic_signature(self, key: str) -> tuple:
+        """Numbers plus schema and time words of a question, which must match for reuse"""
+        return _NUMBER.findall(key), _vocabulary(key) & self._vocabulary
+    
+    def _semantic_cache_get(self, key: str, embedding: Optional[np.ndarray]) -> Optional[Tuple[str, str]]:
+        """
+        Most similar earlier result above the threshold
+        
+        Only questions with the same numbers, tables, columns and time words are
+        compared, so "top 5" never reuses the SQL for "top 10", nor "last week"
+        the SQL for "last month"
+        """
+        if embedding is None:
+            return None
+        signature = self._semantic_signature(key)
+        best, best_score = None, self._semantic_threshold
+        with self._sql_cache_lock:
+            for entry_signature, entry_embedding, result in self._semantic_cache:
+                if entry_signature != signature or entry_embedding.shape != embedding.shape:
+                    continue
+                score = float(entry_embedding @ embedding)
+                if score >= best_score:
+                    best, best_score = result, score
+        return best
+    
+    def _remember_sql(self, key: str, result: Tuple[str, str]):
+        """Add a result to the in-memory LRU cache; caller holds the lock"""
+        self._sql_cache[key] = result
+        if len(self._sql_cache) > self.SQL_CACHE_SIZE:
+            self._sql_cache.popitem(last=False)
+    
+    def _open_disk_cache(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the persistent SQL cache, or return None so the in-memory cache is used alone"""
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sql_cache "
+                "(key TEXT PRIMARY KEY, sql TEXT NOT NULL, explanation TEXT, created_at REAL)"
+            )
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            print(f"SQL cache disabled: {e}")
+            return None
+    
+    def _disk_cache_key(self, key: str) -> str:
+        """Persistent cache key for a normalized question"""
+        return f"{self.model}:{self._schema_hash}:{key}"
+    
+    def _disk_cache_get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Look up a normalized question in the persistent cache; caller holds the lock"""
+        if self._disk_cache is None:
+            return None
+        try:
+            row = self._disk_cache.execute(
+                "SELECT sql, explanation FROM sql_cache WHERE key = ?", (self._disk_cache_key(key),)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return tuple(row) if row else None
+    
+    def _disk_cache_put(self, key: str, result: Tuple[str, str]):
+        """Store a generated result in the persistent cache; caller holds the lock"""
+        if self._disk_cache is None:
+            return
+        try:
+            self._disk_cache.execute(
+                "INSERT OR REPLACE INTO sql_cache (key, sql, explanation, created_at) VALUES (?, ?, ?, ?)",
+                (self._disk_cache_key(key), result[0], result[1], time.time())
+            )
+            self._disk_cache.commit()
+        except sqlite3.Error:
+            pass
+    
+    def _generate_sql(self, question: str) -> Tuple[Optional[str], Optional[str]]:
+        """Ask Ollama for the SQL of one question, uncached"""
+        try:
+            prompt = self._prompt_prefix + question + self._prompt_suffix
+            data = _json_dumps({**self._generate_payload, "prompt": prompt})
             
-            result = response.json()
-            sql = result.get('response', '').strip()
+            for attempt in range(self.MAX_RETRIES + 1):
+                retry_after = None
+                try:
+                    # Call Ollama API, streaming tokens so generation can stop at the end of the statement
+                    with self._session.post(
+                        self.api_url,
+                        data=data,
+                        headers=_JSON_HEADERS,
+                        stream=True,
+                        timeout=100  # 1 minutes timeout for slower models
+                    ) as response:
+                        if response.status_code == 200:
+                            sql, error = self._read_sql_stream(response)
+                            break
+                        if response.status_code not in _RETRY_STATUS_CODES or attempt == self.MAX_RETRIES:
+                            return None, f"Ollama API error: {response.status_code}"
+                        retry_after = response.headers.get('Retry-After')
+                except requests.exceptions.ConnectionError as e:
+                    # A timeout has already used the whole time budget, so it is not retried
+                    if isinstance(e, requests.exceptions.Timeout) or attempt == self.MAX_RETRIES:
+                        raise
+                time.sleep(_retry_delay(attempt, retry_after))
+            
+            if error:
+                return None, error
             
             # Clean up the SQL
             sql = self._clean_sql(sql)
@@ -166,8 +552,9 @@ SQL:"""
             if not sql:
                 return None, "Could not generate SQL query. Please try rephrasing your question."
             
-            # Validate it's a SELECT query
-            if not sql.upper().startswith('SELECT'):
+            # Validate it's a SELECT query, possibly behind a WITH clause,
+            # without uppercasing the whole response
+            if sql.split(None, 1)[0].upper() not in ('SELECT', 'WITH'):
                 return None, "Only SELECT queries are allowed for safety."
             
             explanation = f"Generated SQL using Local AI ({self.model})"
@@ -180,84 +567,119 @@ SQL:"""
         except Exception as e:
             return None, f"Error generating SQL: {str(e)}"
     
-    def _clean_sql(self, sql: str) -> str:
-        """Clean up SQL query from LLM response"""
-        # Remove markdown code blocks
-        sql = sql.replace('```sql', '').replace('```', '')
-        
-        # Remove common prefixes
-        prefixes = ['SQL:', 'Query:', 'Answer:', 'SELECT']
-        for prefix in prefixes[:-1]:  # Don't remove SELECT
-            if sql.startswith(prefix):
-                sql = sql[len(prefix):].strip()
-        
-        # Take only the first query if multiple
-        lines = sql.split('\n')
-        sql_lines = []
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('--'):
+    def _read_sql_stream(self, response) -> Tuple[str, Optional[str]]:
+        """Collect streamed tokens until the statement ends, returning (text, error)"""
+        parts = []
+        for line in response.iter_lines():
+            if not line:
                 continue
-            if line.upper().startswith('SELECT'):
-                sql_lines = [line]
-            elif sql_lines:
-                sql_lines.append(line)
-                if line.endswith(';'):
-                    break
+            chunk = _json_loads(line)
+            if 'error' in chunk:
+                return "", f"Ollama API error: {chunk['error']}"
+            token = chunk.get('response', '')
+            parts.append(token)
+            if chunk.get('done'):
+                break
+            # Closing the stream early makes Ollama stop generating
+            if (';' in token or '`' in token) and _COMPLETE_SELECT.search(''.join(parts)):
+                break
+        return ''.join(parts).strip(), None
+    
+    def decompose_question(self, question: str, raise_errors: bool = False) -> List[str]:
+        """
+        Split a multi-part question into independent sub-questions
         
-        sql = ' '.join(sql_lines) if sql_lines else sql.split('\n')[0]
+        Args:
+            question: Natural language question
+            raise_errors: Raise when the model cannot be reached instead of returning
+                          [question], so callers can avoid caching the failure
+            
+        Returns:
+            List of sub-questions, or [question] when it is short or cannot be split
+        """
+        if len(question.split()) <= self.DECOMPOSE_MIN_WORDS:
+            return [question]
         
-        # Remove trailing semicolon
-        sql = sql.rstrip(';').strip()
+        prompt = f"""Split this question into independent questions that can each be answered by one SQL query.
+If it is already a single question, return it unchanged.
+Return one question per line, no numbering, no explanations.
+
+QUESTION: {question}
+
+QUESTIONS:"""
         
-        return sql
+        try:
+            response = self._session.post(
+                self.api_url,
+                data=_json_dumps({
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "keep_alive": self.KEEP_ALIVE,
+                    "options": self._model_options
+                }),
+                headers=_JSON_HEADERS,
+                timeout=30
+            )
+            if response.status_code != 200:
+                raise requests.exceptions.HTTPError(f"Ollama API error: {response.status_code}")
+            text = _json_loads(response.content).get('response', '')
+        except Exception:
+            if raise_errors:
+                raise
+            return [question]
+        
+        # Keep lines that read as part of the question. Preambles such as "Here are the
+        # questions:" and other commentary share no content words with it
+        question_words = set(_CONTENT_WORD.findall(question.lower())) - _FILLER_WORDS
+        sub_questions = []
+        for line in text.split('\n'):
+            line = _LIST_MARKER.sub('', line).strip()
+            if not line or line.endswith(':'):
+                continue
+            if question_words.isdisjoint(_CONTENT_WORD.findall(line.lower())):
+                continue
+            if line not in sub_questions:
+                sub_questions.append(line)
+        
+        # A single remaining line is the original question, possibly reworded
+        if len(sub_questions) < 2:
+            return [question]
+        return sub_questions[:self.MAX_SUB_QUESTIONS]
+    
+    def parse_questions(self, questions: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Convert several questions to SQL concurrently, preserving order"""
+        if not questions:
+            return []
+        workers = min(len(questions), self.MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.parse_question, questions))
+    
+    def _clean_sql(self, sql: str) -> str:
+        """Clean up SQL query from LLM response"""
+        # Markdown code fences end a statement and start a new line, so prose after
+        # a closing fence is not taken as part of the query
+        sql = _CODE_FENCE.sub(';\n', sql)
+        
+        # Take only the first query if multiple, skipping any prose before it
+        match = _SELECT_STATEMENT.search(sql)
+        if not match:
+            return ""
+        
+        # Drop comments, which would swallow the rest of the query once it is on one line
+        statement = _LITERAL_OR_COMMENT.sub(lambda m: m.group(1) or '', match.group(1))
+        return ' '.join(statement.split())
     
     def get_suggestions(self) -> list:
         """Get list of example questions based on actual database content"""
-        return [
-            # Workspace queries
-            "Show all workspaces and their plans",
-            "Which workspaces are on enterprise plan?",
-            "List suspended workspaces",
-            "Count agents per workspace",
-            
-            # Agent queries
-            "Show all agents using Hindi language",
-            "List all Gujarati and Tamil agents",
-            "Show inactive or draft agents",
-            "How many agents use each language?",
-            
-            # Error and failure analysis
-            "Top 5 error codes from last week",
-            "Show all errors from integration source",
-            
-            
-            # Test and run analysis
-            "Show all failed test runs from last month",
-            "Which runs took longer than 5 seconds?",
-            
-            # Integration queries
-            "Which integrations failed to sync?",
-            "List inactive integrations",
-            
-            # Billing and usage
-            "Total billing cost by workspace",
-            "Show top 5 workspaces by total cost",
-            "Billing usage for last 30 days",
-            
-            # User queries
-            "How many admin users per workspace?",
-            
-            # Complex queries
-            "Most common error messages",
-        ]
+        return list(self.SUGGESTIONS)
     
     def get_available_models(self) -> list:
         """Get list of available Ollama models"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 return [model['name'] for model in data.get('models', [])]
             return []
         except Exception:
@@ -265,4 +687,8 @@ SQL:"""
     
     def test_connection(self) -> bool:
         """Test if Ollama is working"""
-        return self._test_connection()
+        now = time.monotonic()
+        if self._health_checked_at is None or now - self._health_checked_at >= self.HEALTH_CHECK_TTL:
+            self._healthy = self._test_connection()
+            self._health_checked_at = now
+        return self._healthy
@@ -129,7 +129,7 @@ Tables and their purposes:
 - audit_events: Change tracking for who did what, with action being create, update, or delete.
 '''
 
-SAMPLE_QUERIES = [
+SAMPLE_QUERIES = (
     ("Show me all the failed test runs for agent X last week", 
      "SELECT tr.*, a.name as agent_name FROM test_runs tr JOIN agents a ON tr.agent_id = a.id WHERE tr.result = 'fail' AND tr.created_at >= datetime('now', '-7 days') ORDER BY tr.created_at DESC"),
     ("Which integrations are inactive for workspace Y",
@@ -146,4 +146,4 @@ SAMPLE_QUERIES = [
      "SELECT * FROM workspaces ORDER BY created_at DESC"),
     ("Count agents per workspace",
      "SELECT w.name as workspace_name, COUNT(a.id) as agent_count FROM workspaces w LEFT JOIN agents a ON w.id = a.workspace_id GROUP BY w.id, w.name ORDER BY agent_count DESC"),
-]
+)
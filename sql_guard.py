@@ -0,0 +1,128 @@
+"""
+SQL safety checks for generated queries
+Only single read-only SELECT statements are allowed to reach the database
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+try:
+    import sqlglot
+    from sqlglot import exp
+    from sqlglot.dialects.dialect import Dialect
+except ImportError:  # Fall back to keyword checks below
+    sqlglot = None
+
+if sqlglot is not None:
+    _READ_ONLY_ROOTS = (exp.Select, exp.Union, exp.Intersect, exp.Except)
+    _WRITE_NODES = tuple(
+        getattr(exp, name)
+        for name in ('Insert', 'Update', 'Delete', 'Merge', 'Drop', 'Create',
+                     'Alter', 'AlterTable', 'Command', 'Pragma', 'Copy', 'Into')
+        if hasattr(exp, name)
+    )
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_READ_ONLY_START = re.compile(r'^\s*(?:select|with)\b', re.IGNORECASE)
+_WRITE_KEYWORDS = re.compile(
+    r'\b(?:insert|into|update|delete|merge|drop|create|alter|truncate|'
+    r'attach|detach|pragma|vacuum|reindex|grant|revoke|copy)\b',
+    re.IGNORECASE
+)
+
+_TRAILING_LIMIT = re.compile(r'\blimit\s+\d+(?:\s*(?:,|offset)\s*\d+)?\s*;?\s*$', re.IGNORECASE)
+
+READ_ONLY_ERROR = "Only single read-only SELECT queries are allowed for safety."
+DEFAULT_ROW_LIMIT = 1000
+
+
+# SQLAlchemy URL schemes whose sqlglot dialect has a different name
+_DIALECT_ALIASES = {
+    'postgresql': 'postgres',
+    'mssql': 'tsql',
+    'mariadb': 'mysql',
+}
+
+
+def dialect_for_url(db_url: str) -> Optional[str]:
+    """sqlglot dialect name for a SQLAlchemy database URL, or None if sqlglot has no such dialect"""
+    scheme = db_url.partition('://')[0].split('+')[0].lower() or 'sqlite'
+    dialect = _DIALECT_ALIASES.get(scheme, scheme)
+    if sqlglot is not None:
+        try:
+            Dialect.get_or_raise(dialect)
+        except ValueError:
+            return None
+    return dialect
+
+
+@lru_cache(maxsize=256)
+def _parse(sql: str, dialect: str) -> tuple:
+    """Parsed statements for sql, shared by the checks below; callers must not mutate them"""
+    return tuple(s for s in sqlglot.parse(sql, read=dialect) if s is not None)
+
+
+def validate_read_only(sql: str, dialect: Optional[str] = 'sqlite') -> Optional[str]:
+    """
+    Check that sql is a single read-only query
+
+    Args:
+        sql: SQL text to check
+        dialect: sqlglot dialect used to parse the statement, None to use keyword checks
+
+    Returns:
+        An error message if the query is rejected, otherwise None
+    """
+    if sqlglot is not None and dialect is not None:
+        try:
+            statements = _parse(sql, dialect)
+        except Exception as e:
+            return f"Could not parse SQL: {str(e)[:200]}"
+        if len(statements) != 1:
+            return READ_ONLY_ERROR
+        statement = statements[0]
+        if not isinstance(statement, _READ_ONLY_ROOTS) or statement.find(*_WRITE_NODES):
+            return READ_ONLY_ERROR
+        return None
+
+    # Without a parser or a known dialect: blank out string literals so values like 'delete' in a
+    # WHERE clause don't trip the keyword check, then inspect what is left
+    stripped = _STRING_LITERAL.sub("''", sql).strip().rstrip(';')
+    if ';' in stripped or not _READ_ONLY_START.match(stripped) or _WRITE_KEYWORDS.search(stripped):
+        return READ_ONLY_ERROR
+    return None
+
+
+@lru_cache(maxsize=256)
+def apply_row_limit(sql: str, dialect: Optional[str] = 'sqlite', limit: int = DEFAULT_ROW_LIMIT) -> str:
+    """
+    Add a LIMIT to a query that has none, so a generated query cannot scan a whole table
+
+    Args:
+        sql: Read-only SQL query
+        dialect: sqlglot dialect used to parse and render the statement, None if unknown
+        limit: Row limit to add
+
+    Returns:
+        The query with a LIMIT, or sql unchanged if it already has one, cannot be parsed
+        or is for a dialect whose row limit syntax is unknown
+    """
+    if dialect is None:
+        return sql
+    if sqlglot is None:
+        if _TRAILING_LIMIT.search(sql):
+            return sql
+        return f"{sql.strip().rstrip(';')} LIMIT {limit}"
+
+    try:
+        statements = _parse(sql, dialect)
+    except Exception:
+        return sql
+    if len(statements) != 1 or not isinstance(statements[0], _READ_ONLY_ROOTS):
+        return sql
+    if statements[0].args.get('limit'):
+        return sql
+    tree = statements[0].copy()
+    tree.set('limit', exp.Limit(expression=exp.Literal.number(limit)))
+    return tree.sql(dialect=dialect)
@@ -0,0 +1,267 @@
+"""
+Tests for OllamaNLtoSQL response handling, without an Ollama server
+Run with: python -m pytest test_ollama_nl_sql.py
+"""
+
+import json
+
+import pytest
+
+import ollama_nl_sql
+from ollama_nl_sql import OllamaNLtoSQL
+
+
+class FakeStreamResponse:
+    """Streamed /api/generate response yielding one token per line"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.read = 0
+
+    def iter_lines(self):
+        for token in self.tokens:
+            self.read += 1
+            yield json.dumps({'response': token, 'done': False}).encode('utf-8')
+        yield json.dumps({'response': '', 'done': True}).encode('utf-8')
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    """OllamaNLtoSQL that skips the server check and has no optional caches"""
+    monkeypatch.setattr(OllamaNLtoSQL, '_test_connection', lambda self: True)
+    monkeypatch.delenv('OLLAMA_SQL_CACHE_PATH', raising=False)
+    monkeypatch.delenv('OLLAMA_SEM_CACHE_THRESHOLD', raising=False)
+    return OllamaNLtoSQL()
+
+
+def stream(parser, text, size=3):
+    """Feed text to _read_sql_stream in small tokens and return (sql, tokens read)"""
+    response = FakeStreamResponse([text[i:i + size] for i in range(0, len(text), size)])
+    sql, error = parser._read_sql_stream(response)
+    assert error is None
+    return sql, response.read
+
+
+def test_stream_does_not_stop_at_semicolon_inside_literal(parser):
+    text = "SELECT * FROM errors WHERE message LIKE '%;%' ORDER BY created_at DESC LIMIT 10"
+    sql, _ = stream(parser, text)
+    assert parser._clean_sql(sql) == text
+
+
+def test_stream_does_not_stop_at_semicolon_inside_comment(parser):
+    text = "SELECT * FROM errors -- newest first; then by code\nORDER BY created_at DESC"
+    sql, _ = stream(parser, text)
+    assert parser._clean_sql(sql) == "SELECT * FROM errors ORDER BY created_at DESC"
+
+
+def test_stream_stops_at_statement_end(parser):
+    text = "SELECT * FROM agents; SELECT * FROM users; SELECT * FROM errors;"
+    sql, read = stream(parser, text)
+    assert parser._clean_sql(sql) == "SELECT * FROM agents"
+    assert read < len(text) // 3
+
+
+def test_stream_stops_at_closing_fence(parser):
+    text = "```sql\nSELECT * FROM agents\n```\nThis lists every agent and more prose follows."
+    sql, read = stream(parser, text)
+    assert parser._clean_sql(sql) == "SELECT * FROM agents"
+    assert read < len(text) // 3
+
+
+def test_generation_has_no_raw_semicolon_stop(parser):
+    # A stop string would end generation inside LIKE '%;%'
+    assert ';' not in parser._generate_payload['options'].get('stop', [])
+    assert parser._generate_payload['options']['num_predict'] == OllamaNLtoSQL.MAX_SQL_TOKENS
+
+
+def test_semicolon_inside_literal_survives_cleanup(parser):
+    sql = "SELECT * FROM errors WHERE message LIKE '%;%' ORDER BY created_at DESC;"
+    assert parser._clean_sql(sql) == sql.rstrip(';')
+
+
+@pytest.mark.parametrize('response, expected', [
+    # Code fences, labels and leading prose
+    ("```sql\nSELECT 1\n```", "SELECT 1"),
+    ("```sql\nSELECT * FROM agents\n```\nThis selects every agent; enjoy.", "SELECT * FROM agents"),
+    ("SQL: SELECT 1;", "SELECT 1"),
+    ("Query:\nSELECT 1", "SELECT 1"),
+    ("Here is a query to select data:\n```sql\nSELECT * FROM agents;\n```", "SELECT * FROM agents"),
+    ("With the schema above, here it is:\nSELECT 1", "SELECT 1"),
+    # Comments are dropped, '--' and '' inside literals are kept
+    ("SELECT * FROM errors WHERE message LIKE '%--%'", "SELECT * FROM errors WHERE message LIKE '%--%'"),
+    ("SELECT * FROM agents -- all of them\nLIMIT 5", "SELECT * FROM agents LIMIT 5"),
+    ("SELECT * FROM users WHERE name = 'O''Brien'; DROP TABLE users",
+     "SELECT * FROM users WHERE name = 'O''Brien'"),
+    ("SELECT 'it''s; fine' AS note", "SELECT 'it''s; fine' AS note"),
+    # CTEs
+    ("WITH x AS (SELECT * FROM agents) SELECT * FROM x", "WITH x AS (SELECT * FROM agents) SELECT * FROM x"),
+    ("WITH x AS (\nSELECT * FROM agents) SELECT * FROM x", "WITH x AS ( SELECT * FROM agents) SELECT * FROM x"),
+    ("```sql\nWITH RECURSIVE t(n) AS (SELECT 1) SELECT n FROM t;\n```",
+     "WITH RECURSIVE t(n) AS (SELECT 1) SELECT n FROM t"),
+    ("I cannot answer that.", ""),
+])
+def test_clean_sql(parser, response, expected):
+    assert parser._clean_sql(response) == expected
+
+
+def test_stream_stops_at_cte_statement_end(parser):
+    text = "WITH x AS (SELECT * FROM agents) SELECT * FROM x; SELECT * FROM users; SELECT 1;"
+    sql, read = stream(parser, text)
+    assert parser._clean_sql(sql) == "WITH x AS (SELECT * FROM agents) SELECT * FROM x"
+    assert read < len(text) // 3
+
+
+LONG_QUESTION = ("Show the number of active agents per workspace and also list the top 5 "
+                 "error codes from the last week")
+
+
+class FakeReply:
+    """Non-streamed /api/generate response"""
+
+    status_code = 200
+
+    def __init__(self, text):
+        self.content = json.dumps({'response': text}).encode('utf-8')
+
+
+def decompose(parser, monkeypatch, reply):
+    monkeypatch.setattr(parser._session, 'post', lambda *args, **kwargs: FakeReply(reply))
+    return parser.decompose_question(LONG_QUESTION)
+
+
+def test_decompose_drops_preamble_and_numbering(parser, monkeypatch):
+    reply = ("Here are the questions:\n"
+             "1. Show the number of active agents per workspace\n"
+             "2. List the top 5 error codes from the last week\n")
+    assert decompose(parser, monkeypatch, reply) == [
+        "Show the number of active agents per workspace",
+        "List the top 5 error codes from the last week",
+    ]
+
+
+def test_decompose_keeps_single_question_with_preamble_whole(parser, monkeypatch):
+    reply = "Sure, here it is:\n" + LONG_QUESTION
+    assert decompose(parser, monkeypatch, reply) == [LONG_QUESTION]
+
+
+def test_decompose_drops_commentary_lines(parser, monkeypatch):
+    reply = ("Show the number of active agents per workspace\n"
+             "List the top 5 error codes from the last week\n"
+             "I hope this helps!")
+    assert len(decompose(parser, monkeypatch, reply)) == 2
+
+
+def test_short_questions_are_not_decomposed(parser, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no model call expected")
+    monkeypatch.setattr(parser._session, 'post', fail)
+    assert parser.decompose_question("How many agents") == ["How many agents"]
+
+
+def test_decompose_failure_returns_question_or_raises(parser, monkeypatch):
+    class Unavailable:
+        status_code = 503
+    monkeypatch.setattr(parser._session, 'post', lambda *args, **kwargs: Unavailable())
+    assert parser.decompose_question(LONG_QUESTION) == [LONG_QUESTION]
+    with pytest.raises(Exception):
+        parser.decompose_question(LONG_QUESTION, raise_errors=True)
+
+
+def test_sql_cache_key_keeps_case(parser, monkeypatch):
+    calls = []
+
+    def generate(question):
+        calls.append(question)
+        return f"SELECT * FROM workspaces WHERE name = '{question.split()[-1]}'", "generated"
+    monkeypatch.setattr(parser, '_generate_sql', generate)
+
+    assert parser.parse_question("Show workspace Acme")[0].endswith("'Acme'")
+    assert parser.parse_question("Show  workspace Acme")[0].endswith("'Acme'")
+    assert parser.parse_question("Show workspace acme")[0].endswith("'acme'")
+    assert calls == ["Show workspace Acme", "Show workspace acme"]
+
+
+@pytest.mark.parametrize('question', ["", "  ?", "hi", "Hello there!", "thanks", "what can you do"])
+def test_small_talk_is_rejected_without_a_model_call(parser, monkeypatch, question):
+    monkeypatch.setattr(parser, '_generate_sql', lambda q: pytest.fail("no model call expected"))
+    sql, explanation = parser.parse_question(question)
+    assert sql is None and explanation
+
+
+@pytest.mark.parametrize('question', [
+    "How much did we spend this month?",
+    "What went wrong yesterday?",
+    "सभी एजेंट दिखाओ",
+    "બધા એજન્ટ બતાવો",
+])
+def test_data_questions_reach_the_model(parser, monkeypatch, question):
+    monkeypatch.setattr(parser, '_generate_sql', lambda q: ("SELECT 1", "generated"))
+    assert parser.parse_question(question) == ("SELECT 1", "generated")
+
+
+@pytest.mark.parametrize('retry_after, expected', [
+    ('3', 3.0),
+    ('-5', 0.0),
+    ('nan', 0.0),
+    ('inf', ollama_nl_sql.MAX_RETRY_DELAY),
+    ('600', ollama_nl_sql.MAX_RETRY_DELAY),
+])
+def test_retry_after_is_clamped(retry_after, expected):
+    assert ollama_nl_sql._retry_delay(0, retry_after) == expected
+
+
+def test_retry_backoff_without_retry_after():
+    assert 1 <= ollama_nl_sql._retry_delay(0, 'Wed, 21 Oct 2015 07:28:00 GMT') < 2
+    assert ollama_nl_sql._retry_delay(10) == ollama_nl_sql.MAX_RETRY_DELAY
+
+
+@pytest.fixture
+def semantic_parser(monkeypatch):
+    """OllamaNLtoSQL with the semantic cache on and every question embedded identically"""
+    monkeypatch.setattr(OllamaNLtoSQL, '_test_connection', lambda self: True)
+    monkeypatch.delenv('OLLAMA_SQL_CACHE_PATH', raising=False)
+    monkeypatch.setenv('OLLAMA_SEM_CACHE_THRESHOLD', '0.95')
+    parser = OllamaNLtoSQL()
+    monkeypatch.setattr(parser, '_embed', lambda text: ollama_nl_sql.np.ones(4) / 2)
+    calls = []
+
+    def generate(question):
+        calls.append(question)
+        return f"SELECT {len(calls)}", "generated"
+    monkeypatch.setattr(parser, '_generate_sql', generate)
+    parser.calls = calls
+    return parser
+
+
+@pytest.mark.parametrize('first, second', [
+    ("Show errors from last week", "List the errors from last week"),
+    ("Top 5 errors by code", "Top 5 errors grouped by code please"),
+])
+def test_semantic_cache_reuses_paraphrases(semantic_parser, first, second):
+    assert semantic_parser.parse_question(first) == semantic_parser.parse_question(second)
+    assert len(semantic_parser.calls) == 1
+
+
+@pytest.mark.parametrize('first, second', [
+    ("Top 5 errors by code", "Top 10 errors by code"),
+    ("Show errors from last week", "Show errors from last month"),
+    ("Show errors from last week", "Show agents from last week"),
+])
+def test_semantic_cache_keeps_different_numbers_times_and_tables_apart(semantic_parser, first, second):
+    assert semantic_parser.parse_question(first) != semantic_parser.parse_question(second)
+    assert len(semantic_parser.calls) == 2
+
+
+@pytest.mark.parametrize('value', ['abc', '0', '1.5', '-0.2'])
+def test_invalid_similarity_threshold_disables_semantic_cache(monkeypatch, value):
+    monkeypatch.setenv('OLLAMA_SEM_CACHE_THRESHOLD', value)
+    assert OllamaNLtoSQL._semantic_threshold_from_env() is None
+
+
+def test_embed_model_setting(monkeypatch):
+    monkeypatch.setattr(OllamaNLtoSQL, '_test_connection', lambda self: True)
+    monkeypatch.delenv('OLLAMA_EMBED_MODEL', raising=False)
+    assert OllamaNLtoSQL().embed_model == OllamaNLtoSQL.DEFAULT_EMBED_MODEL
+    monkeypatch.setenv('OLLAMA_EMBED_MODEL', 'mxbai-embed-large')
+    assert OllamaNLtoSQL().embed_model == 'mxbai-embed-large'
+    assert OllamaNLtoSQL(embed_model='all-minilm').embed_model == 'all-minilm'
@@ -0,0 +1,81 @@
+"""
+Tests for the read-only SQL guard
+Run with: python -m pytest test_sql_guard.py
+"""
+
+import pytest
+
+import sql_guard
+from sql_guard import READ_ONLY_ERROR, apply_row_limit, dialect_for_url, validate_read_only
+
+ACCEPTED = [
+    "SELECT * FROM agents",
+    "select name from agents where status = 'active';",
+    "WITH recent AS (SELECT * FROM errors) SELECT code, COUNT(*) FROM recent GROUP BY code",
+    "SELECT * FROM agents UNION SELECT * FROM agents",
+    "SELECT * FROM audit_events WHERE action = 'delete'",
+]
+
+REJECTED = [
+    "DELETE FROM agents",
+    "UPDATE agents SET status = 'inactive'",
+    "INSERT INTO agents (name) VALUES ('x')",
+    "DROP TABLE agents",
+    "SELECT * FROM agents; DROP TABLE agents",
+    "SELECT * INTO agents_copy FROM agents",
+    "PRAGMA query_only = OFF",
+    "ATTACH DATABASE 'other.db' AS other",
+]
+
+
+@pytest.fixture(params=['sqlglot', 'keywords'])
+def parser(request, monkeypatch):
+    """Run each check with sqlglot and with the keyword fallback"""
+    apply_row_limit.cache_clear()
+    if request.param == 'keywords':
+        monkeypatch.setattr(sql_guard, 'sqlglot', None)
+    elif sql_guard.sqlglot is None:
+        pytest.skip("sqlglot is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize('sql', ACCEPTED)
+def test_accepts_read_only_queries(parser, sql):
+    assert validate_read_only(sql) is None
+
+
+@pytest.mark.parametrize('sql', REJECTED)
+def test_rejects_writes_and_multiple_statements(parser, sql):
+    assert validate_read_only(sql) is not None
+
+
+@pytest.mark.parametrize('dialect', ['postgres', 'tsql', 'mysql', None])
+def test_rejects_select_into_in_every_dialect(dialect):
+    assert validate_read_only("SELECT * INTO newt FROM agents", dialect) == READ_ONLY_ERROR
+
+
+@pytest.mark.parametrize('url, dialect', [
+    ('sqlite:///data.db', 'sqlite'),
+    ('postgresql+psycopg2://user@host/db', 'postgres'),
+    ('postgres://user@host/db', 'postgres'),
+    ('mssql+pyodbc://user@host/db', 'tsql'),
+    ('mariadb://user@host/db', 'mysql'),
+    ('mysql+pymysql://user@host/db', 'mysql'),
+])
+def test_dialect_for_url(url, dialect):
+    assert dialect_for_url(url) == dialect
+
+
+def test_unknown_dialect_falls_back_to_keyword_checks():
+    if sql_guard.sqlglot is None:
+        pytest.skip("sqlglot is not installed")
+    dialect = dialect_for_url('unknowndb://host/db')
+    assert dialect is None
+    assert validate_read_only("SELECT * FROM agents", dialect) is None
+    assert validate_read_only("DELETE FROM agents", dialect) == READ_ONLY_ERROR
+    assert apply_row_limit("SELECT * FROM agents", dialect) == "SELECT * FROM agents"
+
+
+def test_row_limit_added_only_when_missing(parser):
+    assert apply_row_limit("SELECT * FROM agents", limit=50).upper().endswith("LIMIT 50")
+    assert apply_row_limit("SELECT * FROM agents LIMIT 5", limit=50) == "SELECT * FROM agents LIMIT 5"